@@ -20,6 +20,10 @@ import gseapy as gp
 
 from paths import RESULTADOS_DIR
 
+# Tamaño mínimo de cluster para lanzar ORA. Compartido con la etapa de
+# tablas (resumen_clustering) para que el filtro viva en un solo sitio.
+MIN_GENES_CLUSTER = 3
+
 
 # ============================================================
 # UTILIDADES
@@ -71,9 +75,12 @@ def ora_base(genes: list[str], base: str, out_dir: Path):
 # ORA POR CLUSTER
 # ============================================================
 
-def analisis_funcional_clusters(modo: str, score: int):
+def analisis_funcional_clusters(modo: str, score: int,
+                                min_genes: int = MIN_GENES_CLUSTER):
     """
-    Ejecuta ORA para cada cluster de cada algoritmo.
+    Ejecuta ORA para cada cluster de cada algoritmo con al menos
+    `min_genes` genes (los menores no se consultan: ninguna etapa
+    posterior los usa).
     Devuelve un diccionario:
         { algoritmo: n_ORAs_ejecutados }
     """
@@ -105,7 +112,7 @@ def analisis_funcional_clusters(modo: str, score: int):
 
         n_ora = 0
         for idx, cluster in enumerate(clusters):
-            if len(cluster) < 3:
+            if len(cluster) < min_genes:
                 continue
 
             genes = [g.upper() for g in cluster]
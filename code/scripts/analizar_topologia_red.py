@@ -28,78 +28,305 @@ Contenido del JSON:
     }
 """
 
+import hashlib
 import json
+import random
 from pathlib import Path
 
 import networkx as nx
-import pandas as pd
+import numpy as np
+from scipy.sparse.csgraph import connected_components, shortest_path
+
+try:
+    import orjson  # serialización JSON nativa (opcional)
+except ImportError:
+    orjson = None
+
+# Import único a nivel de módulo: evita pasar por la maquinaria de import
+# en cada llamada a _calcular_metricas_globales (versiones antiguas de
+# NetworkX no traen louvain_communities).
+try:
+    from networkx.algorithms.community import louvain_communities
+    from networkx.algorithms.community.quality import modularity
+    _HAY_LOUVAIN = True
+except ImportError:
+    _HAY_LOUVAIN = False
+
+# Leiden (C++) como acelerador opcional de la detección de comunidades:
+# mucho más rápido que el Louvain de NetworkX y sin el problema de las
+# comunidades mal conectadas.
+try:
+    import igraph
+    import leidenalg
+    _HAY_LEIDEN = True
+except ImportError:
+    _HAY_LEIDEN = False
+
+
+def _comunidades_leiden(G: nx.Graph) -> tuple[list, float]:
+    """
+    Detección de comunidades con leidenalg sobre igraph. Sin pesos, igual
+    que la llamada actual a louvain_communities (las aristas de esta red
+    llevan el atributo `score`, que Louvain no lee).
+    """
+    nodos = list(G.nodes())
+    indice = {n: i for i, n in enumerate(nodos)}
+    aristas = [(indice[u], indice[v]) for u, v in G.edges()]
+
+    g = igraph.Graph(n=len(nodos), edges=aristas)
+    part = leidenalg.find_partition(g, leidenalg.ModularityVertexPartition, seed=42)
+
+    comunidades = [{nodos[i] for i in grupo} for grupo in part]
+    return comunidades, part.modularity
 
+from cache_red import obtener_red
 from paths import PROJECT_ROOT, RESULTADOS_DIR
 
 
+def _escribir_json(path: Path, data: dict) -> None:
+    if orjson is not None:
+        path.write_bytes(
+            orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
+    else:
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+
+
 # ============================================================
 # CARGA DE RED
 # ============================================================
 
-def _cargar_red(path_red: Path) -> nx.Graph:
-    df = pd.read_csv(path_red)
-    if df.empty:
-        return nx.Graph()
-    return nx.from_pandas_edgelist(df, "gen1", "gen2", edge_attr="score")
+# La carga de la red vive en cache_red.obtener_red: el grafo se
+# construye una sola vez por (modo, score) y lo comparten esta etapa
+# y la de clustering.
+
+
+# ============================================================
+# CACHÉ DE PARTICIÓN PRELIMINAR
+# ============================================================
+
+def hash_aristas(G: nx.Graph) -> str:
+    """
+    Hash BLAKE2b del conjunto ordenado de aristas: identifica la red para
+    que etapas posteriores puedan reutilizar la partición sin recalcularla.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for u, v in sorted(tuple(sorted(e)) for e in G.edges()):
+        h.update(f"{u},{v};".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _guardar_cache_particion(G: nx.Graph, comunidades, out_dir: Path,
+                             algoritmo: str) -> None:
+    nodo_a_comunidad = {}
+    for cid, com in enumerate(comunidades):
+        for n in com:
+            nodo_a_comunidad[n] = cid
+
+    cache = {
+        "algorithm": algoritmo,
+        "edge_hash": hash_aristas(G),
+        "node_to_community": nodo_a_comunidad,
+    }
+
+    _escribir_json(out_dir / "partitions_cache.json", cache)
+
+
+# ============================================================
+# COEFICIENTE DE AGRUPAMIENTO (disperso)
+# ============================================================
+
+def _coef_agrupamiento_medio(A) -> float:
+    """
+    Coeficiente de agrupamiento medio vía álgebra dispersa sobre la
+    adyacencia CSR compartida: los triángulos por nodo son diag(A³)/2,
+    calculados como suma por fila de (A² ∘ A). Sustituye el bucle Python
+    de intersección de vecindarios de nx.average_clustering.
+
+    float32: sin riesgo de desbordar (los conteos caben exactos) y la
+    mitad de bytes movidos que float64.
+    """
+    deg = np.diff(A.indptr).astype(np.float64)
+    tri = np.asarray((A @ A).multiply(A).sum(axis=1)).ravel() / 2.0
+
+    posibles = deg * (deg - 1) / 2.0
+    c = np.divide(tri, posibles, out=np.zeros_like(posibles), where=posibles > 0)
+
+    return float(c.mean())
+
+
+# ============================================================
+# DISTANCIAS EN LA COMPONENTE GIGANTE
+# ============================================================
+
+# Por debajo de este tamaño se usan las rutinas exactas de NetworkX:
+# el ahorro de las aproximaciones no compensa su sobrecoste.
+_UMBRAL_EXACTO = 200
+
+
+def _diametro_double_sweep(GC: nx.Graph) -> int:
+    """
+    Estimación del diámetro por doble barrido (double-sweep): BFS desde un
+    nodo arbitrario hasta el más lejano v, BFS desde v hasta el más lejano w,
+    y se itera mientras la excentricidad mejore. Exacto en árboles y cota
+    inferior muy ajustada en redes reales, con coste O(k·(V+E)) en lugar
+    del todos-contra-todos O(V·(V+E)).
+    """
+    origen = next(iter(GC.nodes()))
+    mejor = 0
+
+    for _ in range(GC.number_of_nodes()):
+        dist = nx.single_source_shortest_path_length(GC, origen)
+        lejano, exc = max(dist.items(), key=lambda kv: kv[1])
+        if exc <= mejor:
+            break
+        mejor = exc
+        origen = lejano
+
+    return mejor
+
+
+def _distancias_bfs_compartidas(GC: nx.Graph, k: int = 200, seed: int = 42) -> tuple[int, float]:
+    """
+    Diámetro y longitud media de camino estimados con BFS nativas de
+    scipy.sparse.csgraph sobre la adyacencia CSR (GC es conexa por
+    construcción, así que todas las distancias son finitas):
+
+      1. Una sola llamada resuelve las BFS de las k fuentes muestreadas
+         y alimenta el camino medio.
+      2. El par más lejano observado arranca el doble barrido del
+         diámetro, que encadena BFS mientras la excentricidad mejore.
+    """
+    nodos = list(GC.nodes())
+    n = len(nodos)
+
+    A = nx.to_scipy_sparse_array(GC, nodelist=nodos, format="csr",
+                                 weight=None, dtype=np.float32)
+
+    rng = random.Random(seed)
+    fuentes = rng.sample(range(n), min(k, n))
+
+    D = shortest_path(A, directed=False, unweighted=True, indices=fuentes)
+    camino_medio = float(D.sum()) / (D.size - len(fuentes))
+
+    # Cota inicial del diámetro: el par más lejano del muestreo
+    idx_max = np.unravel_index(np.argmax(D), D.shape)
+    diametro = int(D[idx_max])
+    origen = int(idx_max[1])
+
+    while True:
+        d = shortest_path(A, directed=False, unweighted=True, indices=origen)
+        lejano = int(np.argmax(d))
+        exc = int(d[lejano])
+        if exc > diametro:
+            diametro = exc
+            origen = lejano
+        else:
+            break
+
+    return diametro, camino_medio
+
+
+def _fast_gc_distances(GC: nx.Graph) -> tuple[int, float]:
+    """
+    Devuelve (diametro, camino_medio) de la componente gigante.
+    Exacto para redes pequeñas; BFS compartidas (double-sweep + muestreo
+    en una sola tanda) para las grandes.
+    """
+    if GC.number_of_nodes() <= _UMBRAL_EXACTO:
+        diametro = _diametro_double_sweep(GC) if nx.is_tree(GC) else nx.diameter(GC)
+        return diametro, nx.average_shortest_path_length(GC)
+
+    return _distancias_bfs_compartidas(GC)
 
 
 # ============================================================
 # MÉTRICAS GLOBALES
 # ============================================================
 
-def _calcular_metricas_globales(G: nx.Graph) -> dict:
+def _calcular_metricas_globales(G: nx.Graph) -> tuple[dict, list, str]:
+    """
+    Devuelve (metricas, comunidades, algoritmo). Las comunidades
+    preliminares se devuelven junto con el algoritmo que las produjo
+    (leiden, louvain o componentes) para poder cachearlas en disco con
+    su procedencia y que etapas posteriores las reutilicen.
+    """
     n_nodos = G.number_of_nodes()
     n_aristas = G.number_of_edges()
 
-    # Caso red vacía
-    if n_nodos == 0:
+    # Caso red vacía o sin aristas: ninguna métrica estructural que calcular
+    if n_nodos == 0 or n_aristas == 0:
         return {
-            "n_nodos": 0,
+            "n_nodos": n_nodos,
             "n_aristas": 0,
             "grado_medio": 0.0,
             "densidad": 0.0,
-            "n_componentes": 0,
+            "n_componentes": n_nodos,
             "coef_agrupamiento_medio": 0.0,
             "diametro_gc": None,
             "longitud_camino_media_gc": None,
-            "n_comunidades": 0,
-            "tamano_medio_comunidad": 0.0,
+            "n_comunidades": n_nodos,
+            "tamano_medio_comunidad": 1.0 if n_nodos else 0.0,
             "modularidad_preliminar": None,
-        }
+        }, [], "componentes"
 
-    grados = dict(G.degree())
-    grado_medio = round(sum(grados.values()) / n_nodos, 3)
-    densidad = round(nx.density(G), 4)
-    n_componentes = nx.number_connected_components(G)
-    clustering_medio = round(nx.average_clustering(G), 4)
+    # Una sola adyacencia CSR (SoA contigua) alimenta grados, coeficiente
+    # de agrupamiento y componentes: nada de recorrer los dicts anidados
+    # de NetworkX en los cálculos numéricos.
+    nodos = list(G.nodes())
+    A = nx.to_scipy_sparse_array(G, nodelist=nodos, format="csr",
+                                 weight=None, dtype=np.float32)
 
-    # componente gigante
-    componentes = list(nx.connected_components(G))
+    deg = np.diff(A.indptr)
+    grado_medio = round(float(deg.sum()) / n_nodos, 3)
+    densidad = round(nx.density(G), 4)
+    clustering_medio = round(_coef_agrupamiento_medio(A), 4)
+
+    # Componentes por etiquetas C-nativas + argsort/split, el mismo
+    # esquema etiqueta->grupos que usa clustering.py
+    n_componentes, etiquetas = connected_components(A, directed=False)
+    orden = np.argsort(etiquetas, kind="stable")
+    cortes = np.nonzero(np.diff(etiquetas[orden]))[0] + 1
+    componentes = [
+        {nodos[int(i)] for i in grupo} for grupo in np.split(orden, cortes)
+    ]
+
+    # componente gigante (vista: las BFS posteriores no mutan el grafo)
     largest = max(componentes, key=len)
-    GC = G.subgraph(largest).copy()
+    GC = G.subgraph(largest)
 
     if GC.number_of_nodes() > 1:
-        diametro = nx.diameter(GC)
-        camino_medio = round(nx.average_shortest_path_length(GC), 3)
+        diametro, camino_medio = _fast_gc_distances(GC)
+        camino_medio = round(camino_medio, 3)
     else:
         diametro = None
         camino_medio = None
 
     # comunidades preliminares
-    try:
-        from networkx.algorithms.community import louvain_communities
-        from networkx.algorithms.community.quality import modularity
-
-        comunidades = louvain_communities(G, seed=42)
-        modularidad_preliminar = modularity(G, comunidades) if n_aristas > 0 else None
-    except ImportError:
+    if n_aristas < 3:
+        # Con 1-2 aristas Louvain no aporta nada: cada componente es su
+        # propia comunidad. La modularidad de esa partición no siempre
+        # es 0 (dos aristas disjuntas dan Q = 0.5), así que se calcula
+        # de verdad; a este tamaño cuesta microsegundos.
+        comunidades = [set(c) for c in componentes]
+        modularidad_preliminar = (
+            modularity(G, comunidades, weight=None) if _HAY_LOUVAIN else None
+        )
+        algoritmo_com = "componentes"
+    elif _HAY_LEIDEN:
+        comunidades, modularidad_preliminar = _comunidades_leiden(G)
+        algoritmo_com = "leiden"
+    elif _HAY_LOUVAIN:
+        # weight=None explícito: el grafo compartido lleva `weight` y la
+        # detección de comunidades de esta etapa siempre ha sido sin pesos.
+        comunidades = louvain_communities(G, weight=None, seed=42)
+        modularidad_preliminar = modularity(G, comunidades, weight=None)
+        algoritmo_com = "louvain"
+    else:
         comunidades = [list(c) for c in componentes]
         modularidad_preliminar = None
+        algoritmo_com = "componentes"
 
     tam_medio_com = round(sum(len(c) for c in comunidades) / len(comunidades), 2)
 
@@ -115,7 +342,7 @@ def _calcular_metricas_globales(G: nx.Graph) -> dict:
         "n_comunidades": len(comunidades),
         "tamano_medio_comunidad": tam_medio_com,
         "modularidad_preliminar": modularidad_preliminar,
-    }
+    }, comunidades, algoritmo_com
 
 
 # ============================================================
@@ -130,7 +357,6 @@ def analizar_topologia(modo: str, score: int):
     logging compacto y consistente con el pipeline.
     """
 
-    path_red = RESULTADOS_DIR / "redes" / f"{modo}_score{score}" / f"red_{modo}_score{score}.txt"
     out_dir = RESULTADOS_DIR / "redes" / f"{modo}_score{score}" / "topologia"
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -139,11 +365,15 @@ def analizar_topologia(modo: str, score: int):
     # logging
     print(f"• Topología preliminar... ", end="", flush=True)
 
-    G = _cargar_red(path_red)
-    metricas = _calcular_metricas_globales(G)
+    G = obtener_red(modo, score)
+    metricas, comunidades, algoritmo_com = _calcular_metricas_globales(G)
+
+    _escribir_json(salida_json, metricas)
 
-    with open(salida_json, "w") as f:
-        json.dump(metricas, f, indent=4)
+    # Cachear la partición (con el algoritmo que la produjo) para que el
+    # clustering posterior pueda reutilizarla sin volver a detectarla.
+    if comunidades:
+        _guardar_cache_particion(G, comunidades, out_dir, algoritmo_com)
 
     try:
         rel = salida_json.relative_to(PROJECT_ROOT)
@@ -0,0 +1,59 @@
+"""
+Módulo: cache_red.py
+
+Descripción:
+    Caché en memoria de la red de cada combinación (modo, score). Las
+    etapas de topología y de clustering consumen el mismo fichero de
+    aristas, así que el grafo (y el spring_layout que comparten los
+    gráficos) se construye una sola vez por proceso y se reutiliza.
+
+    La clave de caché es (modo, score): dentro de una ejecución del
+    pipeline la red de cada combinación no cambia entre etapas.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+
+from paths import REDES_DIR
+
+
+def ruta_red(modo: str, score: int) -> Path:
+    return REDES_DIR / f"{modo}_score{score}" / f"red_{modo}_score{score}.txt"
+
+
+@lru_cache(maxsize=8)
+def obtener_red(modo: str, score: int) -> nx.Graph:
+    # Import diferido: clustering.py también importa utilidades de
+    # topología, y este módulo lo comparten ambos; así no hay ciclo.
+    from clustering import build_graph
+    return build_graph(ruta_red(modo, score))
+
+
+@lru_cache(maxsize=8)
+def obtener_layout(modo: str, score: int) -> dict:
+    """
+    spring_layout con caché en disco: el layout es determinista por red
+    (semilla fija), así que se guarda como layout_<hash>.npz junto al
+    fichero de aristas y solo se recalcula si el conjunto de aristas
+    cambió (el hash forma parte del nombre).
+    """
+    from analizar_topologia_red import hash_aristas  # import diferido
+
+    G = obtener_red(modo, score)
+    ruta = ruta_red(modo, score).parent / f"layout_{hash_aristas(G)}.npz"
+
+    if ruta.exists():
+        datos = np.load(ruta, allow_pickle=False)
+        return dict(zip(datos["nodos"], datos["coords"]))
+
+    pos = nx.spring_layout(G, seed=123)
+    if pos:
+        np.savez_compressed(
+            ruta,
+            nodos=np.array(list(pos)),
+            coords=np.array(list(pos.values()), dtype=np.float32),
+        )
+    return pos
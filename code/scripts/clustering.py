@@ -20,7 +20,10 @@ Contenido de cada JSON:
         "algorithm": str,
         "modularity" | "best_modularity" | "codelength": float,
         "communities": list[list[str]],
-        "modularity_trace": list[float] (solo Edge Betweenness)
+        "conductance": list[float] (una por comunidad),
+        "best_index" | "num_iterations" | "trace_path" (solo Edge
+        Betweenness; la traza de modularidad completa se guarda aparte
+        como gn_trace_<modo>_score<score>.npz)
     }
 
 Propósito:
@@ -35,16 +38,54 @@ Propósito:
 """
 
 import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import matplotlib
+matplotlib.use("Agg")  # backend no interactivo: necesario para los workers
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 import networkx as nx
+import numpy as np
+import pandas as pd
 from infomap import Infomap
-from networkx.algorithms.community import greedy_modularity_communities
-from networkx.algorithms.community.quality import modularity
-
+from networkx.algorithms.community import greedy_modularity_communities, louvain_communities
+
+try:
+    import orjson  # serialización JSON nativa (opcional)
+except ImportError:
+    orjson = None
+
+try:
+    import igraph  # dendrograma Girvan-Newman en C (opcional)
+except ImportError:
+    igraph = None
+
+try:
+    import leidenalg  # alternativa O(E log V) a Girvan-Newman (opcional)
+except ImportError:
+    leidenalg = None
+
+try:
+    import pyarrow  # noqa: F401 — parser CSV multihilo (opcional)
+    _ENGINE_CSV = "pyarrow"
+except ImportError:
+    _ENGINE_CSV = "c"
+
+from analizar_topologia_red import hash_aristas
+from cache_red import obtener_layout, obtener_red
+from brandes_numba import NUMBA_DISPONIBLE, betweenness_aristas
 from paths import RESULTADOS_DIR
 
+# Por debajo de este tamaño de componente no compensa el kernel Numba
+_MIN_NODOS_NUMBA = 50
+
+# Límite de aristas para Girvan-Newman (O(V·E²)): por encima se usa Louvain
+# como alternativa. Configurable vía variable de entorno.
+GN_EDGE_LIMIT = int(os.environ.get("BIOENSIS_GN_EDGE_LIMIT", "2000"))
+
 
 # ============================================================
 # RUTAS
@@ -69,13 +110,38 @@ def preparar_rutas(modo: str, score: int):
 # ============================================================
 
 def build_graph(filepath: Path) -> nx.Graph:
-    G = nx.Graph()
-    with filepath.open("r", encoding="utf-8") as f:
-        f.readline()  # ignorar cabecera
-        for line in f:
-            a, b, s = line.strip().split(",")
-            s = float(s)
-            G.add_edge(a, b, sim=s, weight=s, dist=1.0 - s)
+    # Parseo en bloque: el parser pyarrow (multihilo) si está instalado,
+    # con el parser C de pandas sobre el fichero mapeado en memoria como
+    # alternativa (memory_map evita la copia intermedia de lectura; el
+    # motor pyarrow no acepta esa opción). En ambos casos se evita un
+    # frame de Python (split + float + add_edge) por cada arista.
+    opciones = {} if _ENGINE_CSV == "pyarrow" else {"memory_map": True}
+    df = pd.read_csv(filepath, dtype={"score": "float32"},
+                     engine=_ENGINE_CSV, **opciones)
+
+    if df.empty:
+        return nx.Graph()
+
+    # Un único atributo por arista: `weight`, que es el que consumen los
+    # algoritmos de NetworkX. `sim` duplicaba el peso y `dist` (1 - peso)
+    # no tenía consumidores; si hiciera falta se deriva al vuelo.
+    df["weight"] = df["score"]
+    G = nx.from_pandas_edgelist(df, "gen1", "gen2", edge_attr=["weight"])
+
+    # SoA: pesos en un array paralelo (orden del fichero) para las rutas
+    # vectorizadas que no necesitan los dicts de NetworkX.
+    G.graph["pesos"] = df["score"].to_numpy(dtype=np.float32)
+
+    # Factorización nodo->id sin dict de Python: una única Categorical
+    # sobre ambas columnas da códigos int32 contiguos y el array inverso
+    # id->nombre. Consumidores: Infomap (add_links en bloque) y cualquier
+    # ruta CSR que quiera índices ya numéricos.
+    cat = pd.Categorical(pd.concat([df["gen1"], df["gen2"]], ignore_index=True))
+    codigos = cat.codes.astype(np.int32)
+    n_filas = len(df)
+    G.graph["aristas_idx"] = np.column_stack([codigos[:n_filas], codigos[n_filas:]])
+    G.graph["nombres_idx"] = cat.categories.to_numpy()
+
     return G
 
 
@@ -85,8 +151,22 @@ def build_graph(filepath: Path) -> nx.Graph:
 
 def guardar_json(data: dict, folder: Path, filename: str):
     path = folder / filename
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+
+    # Los payloads de comunidades pueden ser de varios MB (score=300):
+    # orjson serializa en código nativo; stdlib json queda como reserva.
+    if orjson is not None:
+        path.write_bytes(
+            orjson.dumps(
+                data,
+                default=list,  # sets de nodos -> listas
+                option=orjson.OPT_INDENT_2
+                | orjson.OPT_SERIALIZE_NUMPY
+                | orjson.OPT_NON_STR_KEYS,
+            )
+        )
+    else:
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
 
 
 # ============================================================
@@ -94,53 +174,434 @@ def guardar_json(data: dict, folder: Path, filename: str):
 # ============================================================
 
 def infomap_partition(G: nx.Graph):
-    im = Infomap("--two-level --silent --seed 42")
-
-    node_to_id = {n: i for i, n in enumerate(G.nodes())}
-    id_to_node = {i: n for n, i in node_to_id.items()}
-
-    for u, v, data in G.edges(data=True):
-        im.add_link(node_to_id[u], node_to_id[v], data.get("weight", 1.0))
+    # num-trials 1 y flow-model explícito: evita que Infomap pruebe varias
+    # semillas o autodetecte el modelo de flujo (la red es no dirigida).
+    im = Infomap("--two-level --silent --seed 42 --num-trials 1 --flow-model undirected")
+
+    # Volcado en bloque: una sola llamada Python->C++ en lugar de un
+    # im.add_link por arista. Si build_graph dejó la factorización
+    # Categorical, los ids vienen ya como códigos int32 (sin hashing de
+    # nombres en Python); si no, se construye el dict clásico.
+    if "aristas_idx" in G.graph:
+        idx = G.graph["aristas_idx"]
+        nombres = G.graph["nombres_idx"]
+        enlaces = list(zip(idx[:, 0].tolist(), idx[:, 1].tolist(),
+                           G.graph["pesos"].tolist()))
+        id_to_node = dict(enumerate(nombres))
+    else:
+        node_to_id = {n: i for i, n in enumerate(G.nodes())}
+        id_to_node = {i: n for n, i in node_to_id.items()}
+        enlaces = [
+            (node_to_id[u], node_to_id[v], data.get("weight", 1.0))
+            for u, v, data in G.edges(data=True)
+        ]
+    if hasattr(im, "add_links"):
+        im.add_links(enlaces)
+    else:  # versiones antiguas de infomap sin API en bloque
+        for s, t, w in enlaces:
+            im.add_link(s, t, w)
 
     im.run()
 
-    comunidades = {}
+    # SoA: un único array de etiquetas nodo->módulo en lugar de un dict
+    # de sets; las comunidades se derivan con argsort + split por cortes.
+    n = G.number_of_nodes()
+    if n == 0:
+        return [], im.codelength
+
+    labels = np.full(n, -1, dtype=np.int32)
     for node_id, module_id in im.modules:
-        comunidades.setdefault(module_id, set()).add(id_to_node[node_id])
+        labels[node_id] = module_id
+
+    orden = np.argsort(labels, kind="stable")
+    cortes = np.nonzero(np.diff(labels[orden]))[0] + 1
+    grupos = np.split(orden, cortes)
+
+    comunidades = [{id_to_node[int(i)] for i in grupo} for grupo in grupos]
+
+    return comunidades, im.codelength
+
+
+# ============================================================
+# CONDUCTANCIA POR COMUNIDAD
+# ============================================================
+
+def _etiquetas_comunidades(nodes: list, communities) -> np.ndarray:
+    """
+    Vector int32 nodo->comunidad alineado con `nodes`. Representación
+    SoA compartida por conductancia y modularidad: los list[set] solo se
+    materializan al serializar el JSON.
+    """
+    idx = {node: i for i, node in enumerate(nodes)}
+    lab = np.empty(len(nodes), dtype=np.int32)
+    for cid, com in enumerate(communities):
+        for node in com:
+            lab[idx[node]] = cid
+    return lab
+
+
+def conductance_report(G: nx.Graph, communities) -> list[float]:
+    """
+    Calcula la conductancia de cada comunidad:
+
+        phi(C) = corte(C) / min(vol(C), 2m - vol(C))
+
+    Implementación vectorizada: una única adyacencia CSR y un vector de
+    etiquetas nodo->comunidad; los cortes y volúmenes de todas las
+    comunidades se obtienen en una sola pasada con np.bincount, sin
+    iterar G.edges() en Python por comunidad.
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+    n_com = len(communities)
+
+    if n == 0 or G.number_of_edges() == 0 or n_com == 0:
+        return [0.0] * n_com
+
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, format="csr", weight=None)
+    lab = _etiquetas_comunidades(nodes, communities)
+
+    # Con weight=None la adyacencia es binaria: el grado de cada nodo es
+    # directamente la longitud de su fila CSR, sin reducción de la matriz.
+    deg = np.diff(A.indptr)
+    fila = np.repeat(np.arange(n), deg)
+
+    # Aristas cuyo extremo opuesto cae fuera de la comunidad (corte).
+    # De los dos slots dirigidos de una arista de corte (u,v), solo el
+    # u→v cae en la comunidad de u (el v→u se atribuye a la de v), así
+    # que el bincount ya es corte(C) sin dividir entre dos.
+    distinta = lab[A.indices] != lab[fila]
+
+    corte = np.bincount(lab[fila], weights=distinta, minlength=n_com)
+    vol = np.bincount(lab, weights=deg, minlength=n_com)
 
-    return list(comunidades.values()), im.codelength
+    dos_m = float(deg.sum())
+    denom = np.minimum(vol, dos_m - vol)
+    phi = np.where(denom > 0, corte / np.maximum(denom, 1e-12), 0.0)
+
+    return [round(float(x), 4) for x in phi]
+
+
+def modularidad_comunidades(G: nx.Graph, communities) -> float:
+    """
+    Modularidad ponderada sobre acumuladores por comunidad:
+
+        Q = sum_c (e_c / m - (a_c / 2m)^2)
+
+    con e_c el peso intracomunitario y a_c la suma de grados ponderados.
+    Misma representación CSR + etiquetas que conductance_report: ambos
+    términos salen de np.bincount en una pasada, sin iterar las aristas
+    en Python como hace nx.community.modularity.
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+
+    if n == 0 or G.number_of_edges() == 0 or len(communities) == 0:
+        return 0.0
+
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, format="csr",
+                                 weight="weight", dtype=np.float64)
+    lab = _etiquetas_comunidades(nodes, communities)
+
+    dos_m = A.data.sum()  # 2m ponderado
+    grados = np.asarray(A.sum(axis=1)).ravel()
+    a = np.bincount(lab, weights=grados, minlength=len(communities))
+
+    fila = np.repeat(np.arange(n), np.diff(A.indptr))
+    intra = lab[fila] == lab[A.indices]
+    # Cada arista interna aparece en sus dos slots dirigidos: esto es 2*e_c
+    e2 = np.bincount(lab[fila[intra]], weights=A.data[intra],
+                     minlength=len(communities))
+
+    return float(np.sum(e2 / dos_m - (a / dos_m) ** 2))
 
 
 # ============================================================
 # GIRVAN–NEWMAN COMPLETO
 # ============================================================
 
-def girvan_newman_full(G: nx.Graph):
-    import copy
-    H = copy.deepcopy(G)
+def _detectar_escision(H: nx.Graph, u, v):
+    """
+    BFS bidireccional tras eliminar la arista (u, v): expande las dos
+    fronteras alternando hacia el lado con menos nodos visitados y se
+    detiene en cuanto se tocan (no hay escisión) o en cuanto el lado
+    menor se agota (escisión). Devuelve None si no hubo escisión, o el
+    conjunto de nodos del lado agotado (el menor) si la hubo.
+
+    Coste O(lado menor · ⟨k⟩) por escisión, frente al O(V + E) de
+    recalcular las componentes conexas completas.
+    """
+    vis_u, vis_v = {u}, {v}
+    front_u, front_v = [u], [v]
+
+    while front_u or front_v:
+        # Avanzar siempre el lado que menos nodos lleva explorados
+        if front_u and (not front_v or len(vis_u) <= len(vis_v)):
+            frontera, visitados, contrarios = front_u, vis_u, vis_v
+            lado_u = True
+        else:
+            frontera, visitados, contrarios = front_v, vis_v, vis_u
+            lado_u = False
+
+        siguiente = []
+        for n in frontera:
+            for vecino in H.adj[n]:
+                if vecino in contrarios:
+                    return None  # las fronteras se tocan: sigue conexo
+                if vecino not in visitados:
+                    visitados.add(vecino)
+                    siguiente.append(vecino)
+
+        if lado_u:
+            front_u = siguiente
+            if not front_u:
+                return vis_u  # lado de u agotado -> componente nueva
+        else:
+            front_v = siguiente
+            if not front_v:
+                return vis_v
+
+    # Inalcanzable en la práctica: un lado se agota antes de vaciarse ambos
+    return vis_u if len(vis_u) <= len(vis_v) else vis_v
+
+
+def _girvan_newman_igraph(G: nx.Graph):
+    """
+    Variante C-nativa: igraph calcula el dendrograma completo de
+    Girvan-Newman en una sola llamada (betweenness no ponderada, igual
+    que la ruta NetworkX) y la traza de modularidad ponderada se evalúa
+    nivel a nivel con g.modularity, también en C.
+    """
+    nodos = list(G.nodes())
+    indice = {n: i for i, n in enumerate(nodos)}
+
+    aristas = [(indice[u], indice[v]) for u, v in G.edges()]
+    pesos = [d.get("weight", 1.0) for _, _, d in G.edges(data=True)]
 
-    modularity_trace = []
-    partitions_trace = []
+    g = igraph.Graph(n=len(nodos), edges=aristas)
+    dend = g.community_edge_betweenness(directed=False)
 
-    while H.number_of_edges() > 0:
-        communities = list(nx.connected_components(H))
-        partitions_trace.append(communities)
-        modularity_trace.append(nx.community.modularity(G, communities))
+    n = len(nodos)
+    n_comp = len(g.connected_components())
 
-        betw = nx.edge_betweenness_centrality(H)
-        edge = max(betw, key=betw.get)
-        H.remove_edge(*edge)
+    traza = np.empty(n - n_comp + 1, dtype=np.float32)
+    mejor_Q = -np.inf
+    mejor_k = n_comp
+
+    for i, k in enumerate(range(n_comp, n + 1)):
+        Q = g.modularity(dend.as_clustering(k).membership, weights=pesos)
+        traza[i] = Q
+        if Q > mejor_Q:
+            mejor_Q = Q
+            mejor_k = k
+
+    comunidades = [
+        {nodos[i] for i in grupo}
+        for grupo in dend.as_clustering(mejor_k)
+    ]
+
+    return comunidades, float(mejor_Q), traza
+
+
+def _leiden_como_gn(G: nx.Graph):
+    """
+    Sustituto O(E log V) del dendrograma Girvan-Newman: partición Leiden
+    (maximización de modularidad, igual objetivo que elegir el mejor corte
+    del dendrograma). La traza tiene un solo punto porque no hay niveles
+    intermedios que evaluar.
+    """
+    nodos = list(G.nodes())
+    indice = {n: i for i, n in enumerate(nodos)}
+
+    aristas = [(indice[u], indice[v]) for u, v in G.edges()]
+    pesos = [d.get("weight", 1.0) for _, _, d in G.edges(data=True)]
+
+    g = igraph.Graph(n=len(nodos), edges=aristas)
+    part = leidenalg.find_partition(
+        g, leidenalg.RBConfigurationVertexPartition,
+        resolution_parameter=1.0, seed=42,
+    )
+
+    # Misma métrica que la ruta igraph de GN: modularidad ponderada en C
+    Q = g.modularity(part.membership, weights=pesos)
+
+    comunidades = [{nodos[i] for i in grupo} for grupo in part]
+    return comunidades, float(Q), np.asarray([Q], dtype=np.float32)
 
-    best_idx = max(range(len(modularity_trace)), key=lambda i: modularity_trace[i])
-    return partitions_trace[best_idx], modularity_trace[best_idx], modularity_trace
+
+def girvan_newman_full(G: nx.Graph, method: str = "girvan_newman"):
+    if method == "leiden":
+        if leidenalg is None or igraph is None:
+            raise ImportError("method='leiden' requiere python-igraph y leidenalg")
+        return _leiden_como_gn(G)
+    if method != "girvan_newman":
+        raise ValueError(f"Método de clustering desconocido: {method!r}")
+
+    # Nada de copias: una máscara de aristas eliminadas y una vista filtrada
+    # sobre G. "Eliminar" una arista es añadirla al conjunto; G no se muta.
+    eliminadas = set()
+
+    def _arista_viva(a, b):
+        return frozenset((a, b)) not in eliminadas
+
+    H = nx.subgraph_view(G, filter_edge=_arista_viva)
+    aristas_vivas = G.number_of_edges()
+
+    # Peso total y grados ponderados sobre G (fijos durante todo el proceso)
+    m = G.size(weight="weight")
+    if m == 0:
+        comunidades = list(nx.connected_components(G))
+        return comunidades, 0.0, np.zeros(1, dtype=np.float32)
+
+    # Si igraph está disponible, todo el dendrograma se calcula en C
+    if igraph is not None:
+        return _girvan_newman_igraph(G)
+
+    grados = dict(G.degree(weight="weight"))
+
+    # --------------------------------------------------------
+    # Estado incremental de la partición:
+    #   comp_id[n]   -> id de la comunidad (componente) de cada nodo
+    #   miembros[c]  -> conjunto de nodos de la comunidad c
+    #   suma_in[c]   -> peso intra-comunidad (sobre aristas de G)
+    #   suma_tot[c]  -> suma de grados ponderados de la comunidad
+    # La modularidad solo cambia cuando una componente se escinde,
+    # por lo que Q se actualiza en O(lado menor) en vez de O(E) por paso.
+    # --------------------------------------------------------
+    comp_id = {}
+    miembros = {}
+    suma_in = {}
+    suma_tot = {}
+
+    for cid, comp in enumerate(nx.connected_components(G)):
+        miembros[cid] = set(comp)
+        suma_tot[cid] = sum(grados[n] for n in comp)
+        suma_in[cid] = sum(
+            d.get("weight", 1.0)
+            for u, v, d in G.edges(comp, data=True)
+            if v in miembros[cid]
+        )
+        for n in comp:
+            comp_id[n] = cid
+
+    def _termino(c):
+        return suma_in[c] / m - (suma_tot[c] / (2 * m)) ** 2
+
+    Q = sum(_termino(c) for c in miembros)
+
+    # Betweenness cacheada por arista; se recalcula únicamente sobre la
+    # componente afectada por cada eliminación (las demás no cambian).
+    # Con normalized=False el argmax coincide con el del cálculo global.
+    betw = {}
+
+    def _recalcular_betw(nodos):
+        sub = H.subgraph(nodos)
+        if NUMBA_DISPONIBLE and sub.number_of_nodes() >= _MIN_NODOS_NUMBA:
+            nuevo = betweenness_aristas(sub)
+        else:
+            nuevo = nx.edge_betweenness_centrality(sub, normalized=False)
+        # Claves canónicas (u, v) ordenadas, coherentes entre ambas rutas
+        for (a, b), val in nuevo.items():
+            betw[(a, b) if a <= b else (b, a)] = val
+
+    _recalcular_betw(H.nodes())
+
+    # Traza preasignada en float32: un valor por eliminación, sin listas
+    # de floats de Python.
+    trace = np.empty(aristas_vivas + 1, dtype=np.float32)
+    trace[0] = Q
+    n_reg = 1
+
+    best_Q = Q
+    best_partition = [set(c) for c in miembros.values()]
+
+    # Parada temprana: si el máximo de Q lleva `paciencia` eliminaciones
+    # sin mejorar, el resto del dendrograma casi nunca lo supera (la
+    # curva de modularidad es unimodal en la práctica). La traza devuelta
+    # queda truncada en el punto de corte.
+    paciencia = max(50, int(0.05 * aristas_vivas))
+    sin_mejora = 0
+
+    while aristas_vivas > 0:
+        # Arista de mayor betweenness entre las supervivientes
+        edge = max(betw, key=betw.get)
+        u, v = edge
+        eliminadas.add(frozenset((u, v)))
+        aristas_vivas -= 1
+        betw.pop(edge, None)
+
+        c = comp_id[u]
+
+        # BFS bidireccional: detecta la escisión explorando solo el lado menor
+        lado_menor = _detectar_escision(H, u, v)
+
+        if lado_menor is None:
+            # La partición no cambia -> Q no cambia; solo se refresca
+            # la betweenness de la componente afectada.
+            _recalcular_betw(miembros[c])
+        else:
+            # Escisión: se reetiqueta únicamente el lado menor
+            lado_resto = miembros[c] - lado_menor
+
+            # Peso intra y cruzado del lado menor, en una pasada sobre G.
+            # El cruce solo cuenta aristas hacia el resto de ESTA comunidad:
+            # las aristas de G hacia comunidades ya escindidas no formaban
+            # parte de suma_in[c] y no deben descontarse.
+            in_menor = 0.0
+            cruce = 0.0
+            for a in lado_menor:
+                for nb, d in G.adj[a].items():
+                    w = d.get("weight", 1.0)
+                    if nb in lado_menor:
+                        in_menor += w
+                    elif nb in lado_resto:
+                        cruce += w
+            in_menor /= 2.0
+
+            nuevo_cid = max(miembros) + 1
+            tot_menor = sum(grados[n] for n in lado_menor)
+
+            Q -= _termino(c)
+
+            miembros[nuevo_cid] = lado_menor
+            suma_in[nuevo_cid] = in_menor
+            suma_tot[nuevo_cid] = tot_menor
+            for n in lado_menor:
+                comp_id[n] = nuevo_cid
+
+            miembros[c] = lado_resto
+            suma_in[c] = suma_in[c] - in_menor - cruce
+            suma_tot[c] = suma_tot[c] - tot_menor
+
+            Q += _termino(c) + _termino(nuevo_cid)
+
+            # Solo las dos componentes nuevas necesitan betweenness fresca
+            _recalcular_betw(lado_menor)
+            _recalcular_betw(lado_resto)
+
+        trace[n_reg] = Q
+        n_reg += 1
+        if Q > best_Q:
+            best_Q = Q
+            best_partition = [set(comp) for comp in miembros.values()]
+            sin_mejora = 0
+        else:
+            sin_mejora += 1
+            if sin_mejora > paciencia:
+                break
+
+    return best_partition, best_Q, trace[:n_reg]
 
 
 # ============================================================
 # PLOT (solo almacenamiento)
 # ============================================================
 
-def plot_graph(G, communities, title, folder: Path, filename: str):
-    pos = nx.spring_layout(G, seed=123)
+def plot_graph(G, communities, title, folder: Path, filename: str, pos=None):
+    # El layout es O(iter·V²): se acepta uno precalculado para no repetirlo
+    # en cada uno de los 3 gráficos de la misma red.
+    if pos is None:
+        pos = nx.spring_layout(G, seed=123)
 
     color_map = {}
     cid = 0
@@ -151,22 +612,195 @@ def plot_graph(G, communities, title, folder: Path, filename: str):
 
     colors = [color_map[n] for n in G.nodes()]
 
+    # Con cientos de nodos las etiquetas dominan el tiempo de render y
+    # resultan ilegibles de todos modos; se omiten a partir de este tamaño.
+    con_etiquetas = G.number_of_nodes() <= 200
+
     plt.figure(figsize=(10, 8))
-    nx.draw(
+    # Dibujo explícito: las aristas como una única LineCollection
+    # construida desde un array (E, 2, 2) de extremos — sin el bucle
+    # Python por arista de nx.draw — y los nodos aparte.
+    segmentos = np.asarray([(pos[u], pos[v]) for u, v in G.edges()],
+                           dtype=np.float32)
+    if len(segmentos):
+        col = LineCollection(segmentos, colors="black", linewidths=0.5,
+                             alpha=0.6, rasterized=True, zorder=1)
+        plt.gca().add_collection(col)
+    nx.draw_networkx_nodes(
         G, pos,
         node_color=colors, cmap=plt.cm.tab20,
-        node_size=350, with_labels=True,
-        font_size=8, edge_color="black"
+        node_size=350 if con_etiquetas else 60,
     )
+    if con_etiquetas:
+        nx.draw_networkx_labels(G, pos, font_size=8)
+
     plt.title(title)
-    plt.savefig(folder / filename, dpi=300, bbox_inches="tight")
+    plt.axis("off")
+    plt.savefig(folder / filename, dpi=150, bbox_inches="tight")
     plt.close()
 
 
+# ============================================================
+# ALGORITMOS (un worker por algoritmo)
+# ============================================================
+
+def _clustering_fast_greedy(G: nx.Graph, modo: str, score: int, folder: Path,
+                            particion_previa=None, pos=None) -> int:
+    # Si la etapa de topología dejó una partición vigente para esta misma
+    # red, se reutiliza (Leiden/Louvain son más rápidos y de mayor
+    # modularidad que CNM); el JSON registra el algoritmo que realmente
+    # la produjo. En caso contrario, greedy modularity como siempre.
+    if particion_previa is not None:
+        communities, algoritmo = particion_previa
+    else:
+        communities = list(greedy_modularity_communities(G, weight="weight"))
+        algoritmo = "fast_greedy"
+
+    # El PNG se renderiza en un hilo aparte (matplotlib suelta el GIL al
+    # codificar) mientras este hilo calcula modularidad/conductancia y
+    # escribe el JSON; el with espera a que el gráfico termine.
+    with ThreadPoolExecutor(max_workers=1) as hilo:
+        futuro_png = hilo.submit(
+            plot_graph, G, communities,
+            f"Algoritmo: Greedy modularity\nRed: {modo} | Score: {score}",
+            folder, f"fast_greedy_{modo}_score{score}.png", pos,
+        )
+
+        guardar_json(
+            {
+                "algorithm": algoritmo,
+                "modularity": modularidad_comunidades(G, communities),
+                "communities": [sorted(list(c)) for c in communities],
+                "conductance": conductance_report(G, communities),
+            },
+            folder,
+            f"fast_greedy_{modo}_score{score}.json",
+        )
+
+        futuro_png.result()  # reflota cualquier excepción del render
+
+    return len(communities)
+
+
+def _clustering_edge_betweenness(G: nx.Graph, modo: str, score: int, folder: Path, pos=None) -> int:
+    # Para redes grandes (score=300) Girvan-Newman es inviable; se deja
+    # constancia en el JSON del sustituto usado: Leiden (compilado) si
+    # está instalado, y si no el Louvain en Python puro de NetworkX.
+    if G.number_of_edges() > GN_EDGE_LIMIT:
+        if leidenalg is not None and igraph is not None:
+            best_coms, best_Q, Q_list = _leiden_como_gn(G)
+            algoritmo = "leiden_fallback_from_gn"
+        else:
+            best_coms = [set(c) for c in louvain_communities(G, seed=42)]
+            best_Q = modularidad_comunidades(G, best_coms)
+            Q_list = [best_Q]
+            algoritmo = "louvain_fallback_from_gn"
+    else:
+        best_coms, best_Q, Q_list = girvan_newman_full(G)
+        algoritmo = "edge_betweenness"
+
+    # PNG en un hilo aparte, solapado con el JSON y la traza (ver
+    # _clustering_fast_greedy)
+    with ThreadPoolExecutor(max_workers=1) as hilo:
+        futuro_png = hilo.submit(
+            plot_graph, G, best_coms,
+            f"Algoritmo: Edge betweenness\nRed: {modo} | Score: {score}",
+            folder, f"edge_betweenness_{modo}_score{score}.png", pos,
+        )
+
+        guardar_json(
+            {
+                "algorithm": algoritmo,
+                "best_modularity": best_Q,
+                "communities": [sorted(list(c)) for c in best_coms],
+                "conductance": conductance_report(G, best_coms),
+                "best_index": int(np.argmax(Q_list)),
+                "num_iterations": len(Q_list),
+                "trace_path": f"gn_trace_{modo}_score{score}.npz",
+            },
+            folder,
+            f"edge_betweenness_{modo}_score{score}.json",
+        )
+        # La traza completa se guarda comprimida aparte: mantenerla dentro
+        # del JSON inflaba el archivo en ~E floats de texto.
+        np.savez_compressed(folder / f"gn_trace_{modo}_score{score}.npz",
+                            trace=np.asarray(Q_list, dtype=np.float32))
+
+        futuro_png.result()  # reflota cualquier excepción del render
+
+    return len(best_coms)
+
+
+def _clustering_infomap(G: nx.Graph, modo: str, score: int, folder: Path, pos=None) -> int:
+    com_infomap, L = infomap_partition(G)
+
+    # PNG en un hilo aparte, solapado con el JSON (ver _clustering_fast_greedy)
+    with ThreadPoolExecutor(max_workers=1) as hilo:
+        futuro_png = hilo.submit(
+            plot_graph, G, com_infomap,
+            f"Algoritmo: Infomap\nRed: {modo} | Score: {score}",
+            folder, f"infomap_{modo}_score{score}.png", pos,
+        )
+
+        guardar_json(
+            {
+                "algorithm": "infomap",
+                "codelength": L,
+                "communities": [sorted(list(c)) for c in com_infomap],
+                "conductance": conductance_report(G, com_infomap),
+            },
+            folder,
+            f"infomap_{modo}_score{score}.json",
+        )
+
+        futuro_png.result()  # reflota cualquier excepción del render
+
+    return len(com_infomap)
+
+
 # ============================================================
 # EJECUCIÓN DESDE PIPELINE
 # ============================================================
 
+def _cargar_particion_cacheada(base: Path, G: nx.Graph):
+    """
+    Carga la partición cacheada por analizar_topologia_red.py si existe y
+    su hash de aristas coincide con la red actual. Devuelve la tupla
+    (comunidades, algoritmo) — el algoritmo que la produjo, tal y como lo
+    registró la caché — o None si no hay partición vigente.
+    """
+    cache_path = base / "topologia" / "partitions_cache.json"
+    if not cache_path.exists():
+        return None
+
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if cache.get("edge_hash") != hash_aristas(G):
+        return None
+
+    mapa = cache.get("node_to_community", {})
+    if set(mapa) != set(G.nodes()):
+        return None
+
+    comunidades = {}
+    for nodo, cid in mapa.items():
+        comunidades.setdefault(cid, set()).add(nodo)
+
+    return list(comunidades.values()), cache.get("algorithm", "louvain")
+
+
+def _contexto_fork():
+    # En Linux/macOS `fork` evita re-serializar el grafo hacia cada worker;
+    # en plataformas sin fork se usa el contexto por defecto.
+    try:
+        return multiprocessing.get_context("fork")
+    except ValueError:
+        return None
+
+
 def ejecutar_clustering(modo: str, score: int):
     """
     Ejecuta los 3 algoritmos sobre la red y devuelve:
@@ -175,76 +809,36 @@ def ejecutar_clustering(modo: str, score: int):
             "edge_betweenness": n_clusters,
             "infomap": n_clusters
         }
+
+    Los 3 algoritmos son independientes y trabajan sobre el mismo grafo
+    inmutable, así que se lanzan en paralelo (un proceso por algoritmo).
     """
     print(f"• Clustering (FG / EB / I)...", end="")
 
     base = RESULTADOS_DIR / "redes" / f"{modo}_score{score}"
-    path_red = base / f"red_{modo}_score{score}.txt"
 
     greedy_dir, edge_dir, infomap_dir = preparar_rutas(modo, score)
 
-    G = build_graph(path_red)
-
-    resumen = {}
-
-    # --------------------------------------------------------
-    # 1) Greedy Modularity
-    # --------------------------------------------------------
-    communities = list(greedy_modularity_communities(G, weight="weight"))
-    Q = modularity(G, communities)
-
-    guardar_json(
-        {
-            "algorithm": "fast_greedy",
-            "modularity": Q,
-            "communities": [sorted(list(c)) for c in communities],
-        },
-        greedy_dir,
-        f"fast_greedy_{modo}_score{score}.json",
-    )
-    # PNG
-    plot_graph(G, communities, f"Algoritmo: Greedy modularity\nRed: {modo} | Score: {score}", greedy_dir, f"fast_greedy_{modo}_score{score}.png")
-
-    resumen["fast_greedy"] = len(communities)
+    # Grafo y layout compartidos con la etapa de topología (caché por
+    # (modo, score)); los 3 gráficos reutilizan el mismo spring_layout.
+    G = obtener_red(modo, score)
+    pos = obtener_layout(modo, score)
 
-    # --------------------------------------------------------
-    # 2) Edge betweenness
-    # --------------------------------------------------------
-    best_coms, best_Q, Q_list = girvan_newman_full(G)
-
-    guardar_json(
-        {
-            "algorithm": "edge_betweenness",
-            "best_modularity": best_Q,
-            "communities": [sorted(list(c)) for c in best_coms],
-            "modularity_trace": Q_list,
-        },
-        edge_dir,
-        f"edge_betweenness_{modo}_score{score}.json",
-    )
-    # PNG
-    plot_graph(G, best_coms, f"Algoritmo: Edge betweenness\nRed: {modo} | Score: {score}", edge_dir, f"edge_betweenness_{modo}_score{score}.png")
-
-    resumen["edge_betweenness"] = len(best_coms)
+    # Partición de la etapa de topología (si sigue vigente): evita
+    # repetir la detección de comunidades en el paso greedy.
+    particion = _cargar_particion_cacheada(base, G)
 
-    # --------------------------------------------------------
-    # 3) Infomap
-    # --------------------------------------------------------
-    com_infomap, L = infomap_partition(G)
-
-    guardar_json(
-        {
-            "algorithm": "infomap",
-            "codelength": L,
-            "communities": [sorted(list(c)) for c in com_infomap],
-        },
-        infomap_dir,
-        f"infomap_{modo}_score{score}.json",
-    )
-    # PNG
-    plot_graph(G, com_infomap, f"Algoritmo: Infomap\nRed: {modo} | Score: {score}", infomap_dir, f"infomap_{modo}_score{score}.png")
-
-    resumen["infomap"] = len(com_infomap)
+    resumen = {}
+    with ProcessPoolExecutor(max_workers=3, mp_context=_contexto_fork()) as ex:
+        futuros = {
+            ex.submit(_clustering_fast_greedy, G, modo, score, greedy_dir, particion, pos): "fast_greedy",
+            ex.submit(_clustering_edge_betweenness, G, modo, score, edge_dir, pos): "edge_betweenness",
+            ex.submit(_clustering_infomap, G, modo, score, infomap_dir, pos): "infomap",
+        }
+        # Recogida según terminan: un fallo en cualquier worker aflora sin
+        # esperar a que acabe el más lento (normalmente Girvan-Newman).
+        for futuro in as_completed(futuros):
+            resumen[futuros[futuro]] = futuro.result()
 
     print(" ✓ OK")
     return resumen
\ No newline at end of file
@@ -21,8 +21,10 @@ Salida:
         red_<modo>_score<score>.png
 """
 
+import hashlib
 import io
 import json
+from functools import lru_cache
 from pathlib import Path
 
 import matplotlib
@@ -44,16 +46,46 @@ HPO_ANNOTATIONS_URL = (
 )
 SPECIES_ID = 9606
 
+# Caché local de respuestas HTTP: las mismas descargas (anotaciones HPO,
+# red STRING por lista de genes y score) se repiten en cada ejecución
+# durante el desarrollo y los inputs remotos cambian muy de tarde en tarde.
+CACHE_HTTP_DIR = Path.home() / ".cache" / "bioensis"
+
 
 # ============================================================
 # FUNCIONES AUXILIARES
 # ============================================================
 
-def obtener_genes_hpo(term_id: str) -> list[str]:
-    response = requests.get(HPO_ANNOTATIONS_URL)
+def _peticion_cacheada(url: str, payload: dict = None) -> str:
+    """
+    Devuelve el cuerpo de la petición, sirviéndolo desde CACHE_HTTP_DIR
+    si la misma URL (y payload, para POST) ya se descargó antes. Para
+    forzar una descarga nueva basta con borrar el directorio de caché.
+    """
+    h = hashlib.blake2b(url.encode("utf-8"), digest_size=16)
+    if payload is not None:
+        h.update(json.dumps(payload, sort_keys=True).encode("utf-8"))
+    ruta = CACHE_HTTP_DIR / f"{h.hexdigest()}.txt"
+
+    if ruta.exists():
+        return ruta.read_text()
+
+    if payload is None:
+        response = requests.get(url)
+    else:
+        response = requests.post(url, data=payload)
     response.raise_for_status()
 
-    df = pd.read_csv(io.StringIO(response.text), sep="\t", comment="#")
+    CACHE_HTTP_DIR.mkdir(parents=True, exist_ok=True)
+    ruta.write_text(response.text)
+    return response.text
+
+
+@lru_cache(maxsize=None)
+def obtener_genes_hpo(term_id: str) -> list[str]:
+    texto = _peticion_cacheada(HPO_ANNOTATIONS_URL)
+
+    df = pd.read_csv(io.StringIO(texto), sep="\t", comment="#")
     df = df[df["hpo_id"] == term_id]
 
     genes = sorted(df["gene_symbol"].unique().tolist())
@@ -93,10 +125,7 @@ def consultar_string(genes: list[str], score: int) -> pd.DataFrame:
         "network_flavor": "evidence",
     }
 
-    response = requests.post(api_url, data=payload)
-    response.raise_for_status()
-
-    return pd.read_csv(io.StringIO(response.text), sep="\t")
+    return pd.read_csv(io.StringIO(_peticion_cacheada(api_url, payload)), sep="\t")
 
 
 def visualizar_red(df: pd.DataFrame, threshold: int, out_png: Path, titulo: str, n_nodos: int):
@@ -154,6 +183,9 @@ def generar_red(modo: str, score: int, hpo: str = None, genes_file: Path = None)
 
     df_clean = df_raw[["preferredName_A", "preferredName_B", "score"]].copy()
     df_clean.columns = ["gen1", "gen2", "score"]
+    # float32 desde el origen: es el dtype con el que trabajan todas las
+    # etapas posteriores (topología y clustering leen score como float32).
+    df_clean["score"] = df_clean["score"].astype("float32")
     df_clean.to_csv(txt_out, index=False)
 
     # --------------------------------------------------------
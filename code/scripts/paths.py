@@ -2,18 +2,20 @@
 Módulo: paths.py
 
 Descripción:
-    Define rutas globales del proyecto y garantiza que la estructura
-    base de directorios bajo `resultados/` exista siempre.
+    Define rutas globales del proyecto y ofrece la creación de la
+    estructura de directorios bajo `resultados/`.
 
-Estructura mínima creada automáticamente:
+    La estructura NO se crea al importar: los puntos de entrada
+    (pipeline.py) llaman a asegurar_estructura_resultados(), que crea
+    redes/ y, si se le pasan los modos y scores, todo el subárbol de
+    cada combinación en una sola tanda de makedirs.
 
-    resultados/
-        redes/
-
-El resto de subdirectorios (por modo, score, clustering, funcional, etc.)
-se crean en los módulos correspondientes usando mkdir(parents=True, exist_ok=True).
+El resto de subdirectorios se crean en los módulos correspondientes
+usando mkdir(parents=True, exist_ok=True).
 """
 
+import os
+from functools import cache
 from pathlib import Path
 
 # Ruta raíz del proyecto (directorio `codigo/`)
@@ -26,18 +28,23 @@ RESULTADOS_DIR = PROJECT_ROOT / "results"
 REDES_DIR = RESULTADOS_DIR / "redes"
 
 
-def asegurar_estructura_resultados() -> None:
+@cache
+def asegurar_estructura_resultados(modos: tuple = (), scores: tuple = ()) -> None:
     """
-    Crea la estructura básica de resultados necesaria para que cualquier módulo
-    pueda escribir sin errores, asumiendo que al inicio solo existe `resultados/`
-    (o ni eso).
+    Crea la estructura de resultados necesaria para que cualquier módulo
+    pueda escribir sin errores. Con modos y scores (tuplas, para que la
+    llamada sea cacheable) crea además el subárbol completo de cada
+    combinación; la memoización evita repetir los mkdir dentro del
+    mismo proceso.
     """
-    RESULTADOS_DIR.mkdir(parents=True, exist_ok=True)
-    REDES_DIR.mkdir(parents=True, exist_ok=True)
-
-
-# Se ejecuta al importar el módulo
-asegurar_estructura_resultados()
+    os.makedirs(REDES_DIR, exist_ok=True)  # crea también RESULTADOS_DIR
+
+    base = os.fspath(REDES_DIR)
+    for modo in modos:
+        for score in scores:
+            carpeta = os.path.join(base, f"{modo}_score{score}")
+            for sub in ("topologia", "clustering", "funcional"):
+                os.makedirs(os.path.join(carpeta, sub), exist_ok=True)
 
 # Ruta a la lista de genes manual
 LISTA_GENES_MANUAL = PROJECT_ROOT / "genes" / "lista_genes_manual.json"
\ No newline at end of file
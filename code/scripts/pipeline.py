@@ -12,7 +12,14 @@ Descripción:
 
     5. Generación de tablas comparativas para las distintas combinaciones exploradas
 """
+import hashlib
+import json
+import multiprocessing
+import os
 import random
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing
 
 import numpy as np
 
@@ -21,7 +28,11 @@ from analizar_topologia_red import analizar_topologia
 from clustering import ejecutar_clustering
 from analisis_funcional_clusters import analisis_funcional_clusters
 from resumen_clustering import generar_tabla_clusters_avanzada
-from paths import LISTA_GENES_MANUAL
+from paths import (
+    LISTA_GENES_MANUAL,
+    RESULTADOS_DIR,
+    asegurar_estructura_resultados,
+)
 
 # ============================================================
 # CONFIGURACIÓN GENERAL
@@ -30,77 +41,197 @@ from paths import LISTA_GENES_MANUAL
 HPO_TERM = "HP:0007354"
 MODOS = ["hpo", "manual"]
 SCORES = [300, 700, 900]
+ALGS = ("fast_greedy", "edge_betweenness", "infomap")
 
-# Diccionarios para almacenar resultados
-tabla_clusters = {
-    "hpo": {300: {}, 700: {}, 900: {}},
-    "manual": {300: {}, 700: {}, 900: {}},
-}
+# Etiquetas de impresión precalculadas (constantes durante todo el run)
+_ETIQUETAS_ALG = {alg: f"      - {alg}:".ljust(28) for alg in ALGS}
 
 # Semilla para garantizar reproducibilidad
 SEED = 42
 random.seed(SEED)
 np.random.seed(SEED)
 
+# ============================================================
+# ALMACÉN DE RESULTADOS (SQLite)
+# ============================================================
+
+# Cada worker inserta sus filas (modo, score, algoritmo, n_clusters) en
+# cuanto termina: los resultados parciales sobreviven a un fallo y el
+# paso final de tablas los lee del disco en lugar de recibirlos por
+# pickling entre procesos.
+RESULTADOS_DB = RESULTADOS_DIR / "tabla_clusters.sqlite"
+
+
+def _conexion_resultados() -> sqlite3.Connection:
+    con = sqlite3.connect(RESULTADOS_DB, timeout=30)
+    # WAL + synchronous NORMAL: escrituras concurrentes de los workers
+    # sin serializar cada commit con un fsync completo.
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS resultados (
+            modo       TEXT    NOT NULL,
+            score      INTEGER NOT NULL,
+            algoritmo  TEXT    NOT NULL,
+            n_clusters INTEGER NOT NULL,
+            PRIMARY KEY (modo, score, algoritmo)
+        )
+        """
+    )
+    return con
+
+
+def _guardar_resultados(modo: str, score: int, res_clust: dict) -> None:
+    with closing(_conexion_resultados()) as con, con:
+        con.executemany(
+            "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?)",
+            [(modo, score, alg, n) for alg, n in res_clust.items()],
+        )
+
+
+def _cargar_tabla_clusters() -> dict:
+    tabla = {modo: {score: {} for score in SCORES} for modo in MODOS}
+    with closing(_conexion_resultados()) as con:
+        filas = con.execute(
+            "SELECT modo, score, algoritmo, n_clusters FROM resultados"
+        ).fetchall()
+    for modo, score, alg, n in filas:
+        if modo in tabla and score in tabla[modo]:
+            tabla[modo][score][alg] = n
+    return tabla
+
+
+# ============================================================
+# CACHÉ DE ETAPAS
+# ============================================================
+
+# Cada etapa es una función pura de (modo, score) y de sus insumos
+# (término HPO, lista manual de genes): si ya se ejecutó con los mismos
+# valores, se recupera su resultado en lugar de repetirla. Para forzar
+# una ejecución limpia basta con borrar results/.cache.
+CACHE_ETAPAS_DIR = RESULTADOS_DIR / ".cache"
+
+
+def _clave_etapa(etapa: str, modo: str, score: int) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{etapa}|{modo}|{score}|{HPO_TERM}".encode("utf-8"))
+    if modo == "manual":
+        # La lista manual entra por contenido: editarla invalida la caché
+        h.update(LISTA_GENES_MANUAL.read_bytes())
+    return h.hexdigest()
+
+
+def _etapa_cacheada(etapa: str, funcion, modo: str, score: int):
+    ruta = CACHE_ETAPAS_DIR / f"{etapa}_{_clave_etapa(etapa, modo, score)}.json"
+
+    if ruta.exists():
+        return json.loads(ruta.read_text())["resultado"]
+
+    resultado = funcion()
+
+    CACHE_ETAPAS_DIR.mkdir(parents=True, exist_ok=True)
+    ruta.write_text(json.dumps({"resultado": resultado}))
+    return resultado
+
+# ============================================================
+# PROCESADO DE UNA COMBINACIÓN (modo, score)
+# ============================================================
+
+def _procesar_red(modo: str, score: int):
+    """
+    Ejecuta las etapas 1-4 para una combinación (modo, score). Las 6
+    combinaciones son independientes entre sí, así que esta función se
+    lanza como worker de un ProcessPoolExecutor; las semillas se fijan
+    dentro para que la reproducibilidad no dependa del reparto de tareas.
+    """
+    random.seed(SEED)
+    np.random.seed(SEED)
+
+    print(f"» Procesando red: modo = {modo} | score = {score}")
+
+    # =====================================================
+    # 1) GENERAR RED STRING
+    # =====================================================
+    if modo == "hpo":
+        _etapa_cacheada(
+            "generar_red",
+            lambda: generar_red(modo="hpo", score=score, hpo=HPO_TERM),
+            modo, score,
+        )
+    else:
+        _etapa_cacheada(
+            "generar_red",
+            lambda: generar_red(modo="manual", score=score,
+                                genes_file=LISTA_GENES_MANUAL),
+            modo, score,
+        )
+
+    # =====================================================
+    # 2) ANÁLISIS TOPOLOGÍA PRELIMINAR
+    # =====================================================
+    _etapa_cacheada(
+        "topologia", lambda: analizar_topologia(modo, score), modo, score
+    )
+
+    # =====================================================
+    # 3) CLUSTERING
+    # =====================================================
+    res_clust = _etapa_cacheada(
+        "clustering", lambda: ejecutar_clustering(modo, score), modo, score
+    )
+
+    # =====================================================
+    # 4) ORA POR CLUSTERS
+    # =====================================================
+    res_ora = _etapa_cacheada(
+        "funcional", lambda: analisis_funcional_clusters(modo, score),
+        modo, score,
+    )
+
+    # Persistir las filas de este worker en cuanto están listas: si el
+    # run se interrumpe, la etapa de tablas dispone de lo ya calculado.
+    _guardar_resultados(modo, score, res_clust)
+
+    return modo, score, res_clust, res_ora
+
+
+def _contexto_fork():
+    # Igual que en clustering.py: fork evita re-serializar estado hacia
+    # los workers donde está disponible.
+    try:
+        return multiprocessing.get_context("fork")
+    except ValueError:
+        return None
+
+
 # ============================================================
 # PIPELINE COMPLETO
 # ============================================================
 
 def pipeline():
 
-    tabla_clusters = {
-        "hpo": {300: {}, 700: {}, 900: {}},
-        "manual": {300: {}, 700: {}, 900: {}},
-    }
+    # Toda la estructura de directorios en una sola tanda de makedirs
+    asegurar_estructura_resultados(tuple(MODOS), tuple(SCORES))
+
+    tareas = [(modo, score) for modo in MODOS for score in SCORES]
 
-    for modo in MODOS:
-        for score in SCORES:
+    with ProcessPoolExecutor(
+        max_workers=min(len(tareas), os.cpu_count() or 1),
+        mp_context=_contexto_fork(),
+    ) as pool:
+        futuros = [pool.submit(_procesar_red, modo, score) for modo, score in tareas]
+
+        for futuro in as_completed(futuros):
+            modo, score, res_clust, res_ora = futuro.result()
 
             print("--------------------------------------------------")
-            print(f" Procesando red: modo = {modo} | score = {score}")
+            print(f" Red completada: modo = {modo} | score = {score}")
             print("--------------------------------------------------")
-
-            # =====================================================
-            # 1) GENERAR RED STRING
-            # =====================================================
-            if modo == "hpo":
-                generar_red(
-                    modo="hpo",
-                    score=score,
-                    hpo=HPO_TERM
-                )
-            else:
-                generar_red(
-                    modo="manual",
-                    score=score,
-                    genes_file=LISTA_GENES_MANUAL
-                )
-
-            # =====================================================
-            # 2) ANÁLISIS TOPOLOGÍA PRELIMINAR
-            # =====================================================
-            analizar_topologia(modo, score)
-
-            # =====================================================
-            # 3) CLUSTERING
-            # =====================================================
-            res_clust = ejecutar_clustering(modo, score)
-
-            # Guardar número de clusters para la tabla comparativa
-            tabla_clusters[modo][score] = res_clust
-
-            print("      - fast_greedy:".ljust(28), f"{res_clust['fast_greedy']} clusters")
-            print("      - edge_betweenness:".ljust(28), f"{res_clust['edge_betweenness']} clusters")
-            print("      - infomap:".ljust(28), f"{res_clust['infomap']} clusters")
-
-            # =====================================================
-            # 4) ORA POR CLUSTERS
-            # =====================================================
-            res_ora = analisis_funcional_clusters(modo, score)
-
-            print("      - fast_greedy:".ljust(28), f"{res_ora['fast_greedy']} ORA ✓ OK")
-            print("      - edge_betweenness:".ljust(28), f"{res_ora['edge_betweenness']} ORA ✓ OK")
-            print("      - infomap:".ljust(28), f"{res_ora['infomap']} ORA ✓ OK")
+            for alg in ALGS:
+                print(_ETIQUETAS_ALG[alg], f"{res_clust[alg]} clusters")
+            for alg in ALGS:
+                print(_ETIQUETAS_ALG[alg], f"{res_ora[alg]} ORA ✓ OK")
 
     # =====================================================
     # 5) TABLAS COMPARATIVAS
@@ -110,6 +241,10 @@ def pipeline():
     print(" Generando tablas comparativas para las distinas configuraciones")
     print("\n-------------------------------------------------------------------------")
 
+    # Las filas se leen del almacén en disco: incluye lo persistido por
+    # runs anteriores interrumpidos, no solo lo devuelto por este pool.
+    tabla_clusters = _cargar_tabla_clusters()
+
     generar_tabla_clusters_avanzada("hpo", tabla_clusters["hpo"])
     generar_tabla_clusters_avanzada("manual", tabla_clusters["manual"])
 
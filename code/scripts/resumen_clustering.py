@@ -17,71 +17,145 @@ Formato de cada celda:
     "<n_clusters> clusters | <media_GO> GO medio"
 """
 
+from functools import lru_cache
 from pathlib import Path
+import csv
 import json
-import numpy as np
+import os
 import pandas as pd
 
+from analisis_funcional_clusters import MIN_GENES_CLUSTER
 from paths import RESULTADOS_DIR, PROJECT_ROOT
 
+# Prefijo precalculado una vez: el bucle de la tabla compone 9 rutas por
+# modo y cada `/` de pathlib construye un PurePath intermedio.
+_REDES_STR = os.fspath(RESULTADOS_DIR / "redes")
 
-# ------------------------------------------------------------
-# Cargar comunidades desde clustering (JSON)
-# ------------------------------------------------------------
+# Orden de columnas de la tabla comparativa
+_ALGORITMOS = ("infomap", "fast_greedy", "edge_betweenness")
 
-def cargar_clusters(path_json: Path):
-    if not path_json.exists():
-        return None
-    data = json.loads(path_json.read_text())
-    clusters = data.get("communities", [])
-    return clusters
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
+
+# orjson parsea los JSON de clustering varias veces más rápido que la
+# stdlib; si no está instalado, json.loads produce el mismo resultado.
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
 
 
 # ------------------------------------------------------------
-# Contar términos GO significativos para un cluster
+# Cargar comunidades desde clustering (JSON)
 # ------------------------------------------------------------
 
-def contar_GO_cluster(cluster_dir: Path) -> int:
-    """
-    Cluster_dir = .../funcional/<algoritmo>/cluster_X
-
-    Se analiza SOLO:
-        cluster_dir / "GO" / "enrichment_results.csv"
-    """
-    go_csv = cluster_dir / "GO" / "enrichment_results.csv"
-    if not go_csv.exists():
-        return 0
-
-    df = pd.read_csv(go_csv)
+@lru_cache(maxsize=64)
+def _cargar_clusters_cached(path_str: str):
+    # EAFP: abrir directamente ahorra el stat de exists() (que además era
+    # una comprobación con carrera); se lee en binario, que es lo que
+    # esperan tanto orjson.loads como json.loads.
+    try:
+        with open(path_str, "rb") as f:
+            data = _loads(f.read())
+    except FileNotFoundError:
+        return None
+    return data.get("communities", [])
 
-    if df.empty or "Adjusted P-value" not in df.columns:
-        return 0
 
-    # conteo de términos significativos
-    df_sig = df[df["Adjusted P-value"] < 0.05]
-    return len(df_sig)
+def cargar_clusters(path_json) -> list | None:
+    # Memoización por ruta: las tablas comparativas releen los mismos
+    # JSON de clustering varias veces por (modo, score, algoritmo).
+    # Acepta str u os.PathLike.
+    return _cargar_clusters_cached(os.fspath(path_json))
 
 
 # ------------------------------------------------------------
 # Calcular media GO para todos los clusters de un algoritmo
 # ------------------------------------------------------------
 
-def media_GO_algoritmo(modo: str, score: int, algoritmo: str, clusters: list[list[str]]):
-    base = RESULTADOS_DIR / "redes" / f"{modo}_score{score}" / "funcional" / algoritmo
+def _contar_significativos(ruta: str) -> int | None:
+    """
+    Cuenta en streaming las filas con p ajustada < 0.05, sin materializar
+    un DataFrame que se descartaría tras el len(). Devuelve None si el
+    CSV no existe, está vacío o no trae la columna esperada.
+    """
+    try:
+        with open(ruta, newline="") as f:
+            lector = csv.reader(f)
+            try:
+                cabecera = next(lector)
+                j = cabecera.index("Adjusted P-value")
+            except (StopIteration, ValueError):
+                return None
+            return sum(1 for fila in lector if fila[j] and float(fila[j]) < 0.05)
+    except FileNotFoundError:
+        return None
 
-    conteos = []
 
-    for idx, comunidad in enumerate(clusters):
-        if len(comunidad) < 3:
-            continue  # ignorar clusters pequeños
+def media_GO_algoritmo(modo: str, score: int, algoritmo: str, tam_clusters: list[int]):
+    """
+    Media de términos GO significativos (p ajustada < 0.05) por cluster
+    de ≥ MIN_GENES_CLUSTER genes. Solo necesita los tamaños de los
+    clusters (no las listas de genes). El conteo por cluster usa el
+    lector Arrow (multihilo) si pyarrow está instalado y, si no, un
+    conteo en streaming con el módulo csv de la stdlib; en ningún caso
+    se construye un DataFrame.
+    """
+    base = RESULTADOS_DIR / "redes" / f"{modo}_score{score}" / "funcional" / algoritmo
 
-        cluster_dir = base / f"cluster_{idx}"
-        conteos.append(contar_GO_cluster(cluster_dir))
+    # Los clusters sin CSV (ORA vacío o no ejecutado) cuentan como 0
+    conteos = {
+        f"cluster_{idx}": 0
+        for idx, n_genes in enumerate(tam_clusters)
+        if n_genes >= MIN_GENES_CLUSTER
+    }
 
     if not conteos:
         return 0.0
 
-    return float(np.mean(conteos))
+    # Una sola pasada de scandir enumera los directorios cluster_* (un
+    # syscall por entrada, con ruta ya compuesta); la existencia del CSV
+    # no se comprueba aparte: el lector lanza FileNotFoundError y se trata
+    # como cluster sin resultados.
+    try:
+        with os.scandir(base) as it:
+            entradas = {e.name: e.path for e in it if e.is_dir()}
+    except FileNotFoundError:
+        entradas = {}
+
+    for nombre in conteos:
+        ruta_dir = entradas.get(nombre)
+        if ruta_dir is None:
+            continue
+        ruta = os.path.join(ruta_dir, "GO", "enrichment_results.csv")
+
+        if pacsv is not None:
+            # Lector CSV de Arrow: multihilo y sin DataFrame intermedio;
+            # el conteo de significativos se hace con pyarrow.compute.
+            try:
+                tbl = pacsv.read_csv(
+                    ruta,
+                    convert_options=pacsv.ConvertOptions(
+                        include_columns=["Adjusted P-value"]
+                    ),
+                )
+            except (FileNotFoundError, pa.ArrowInvalid, pa.ArrowKeyError):
+                continue  # CSV ausente, vacío o sin la columna esperada
+            conteos[nombre] = pc.sum(
+                pc.less(tbl["Adjusted P-value"], 0.05)
+            ).as_py() or 0
+        else:
+            n_sig = _contar_significativos(ruta)
+            if n_sig is not None:
+                conteos[nombre] = n_sig
+
+    # Media directa: para una docena de conteos el despacho de numpy
+    # cuesta más que la propia suma.
+    return sum(conteos.values()) / len(conteos)
 
 
 # ------------------------------------------------------------
@@ -102,19 +176,22 @@ def generar_tabla_clusters_avanzada(modo: str, resumen_clusters: dict):
     Esta función añade media_GO y construye la tabla final.
     """
 
-    algoritmos = ["infomap", "fast_greedy", "edge_betweenness"]
-
     filas = []
 
     for score, dicc in resumen_clusters.items():
 
+        # Scores sin resultados de clustering (run interrumpido o parcial)
+        # no generan fila: evita celdas "0 clusters" engañosas.
+        if not dicc:
+            continue
+
         fila = {"Red": modo, "Score": score}
 
-        for alg in algoritmos:
-            # cargar clusters
-            path_json = (
-                RESULTADOS_DIR / "redes" / f"{modo}_score{score}"
-                / "clustering" / alg / f"{alg}_{modo}_score{score}.json"
+        for alg in _ALGORITMOS:
+            # cargar clusters (ruta como string: un único join plano)
+            path_json = os.path.join(
+                _REDES_STR, f"{modo}_score{score}",
+                "clustering", alg, f"{alg}_{modo}_score{score}.json",
             )
             clusters = cargar_clusters(path_json)
 
@@ -122,21 +199,26 @@ def generar_tabla_clusters_avanzada(modo: str, resumen_clusters: dict):
                 fila[alg] = "0 clusters | 0 GO medio"
                 continue
 
-            n_clusters = len(clusters)
-            media_go = media_GO_algoritmo(modo, score, alg, clusters)
+            # Solo los tamaños viajan a la etapa de medias: las listas de
+            # genes en sí no se necesitan más allá de este punto.
+            tam_clusters = [len(c) for c in clusters]
+            n_clusters = len(tam_clusters)
+            media_go = media_GO_algoritmo(modo, score, alg, tam_clusters)
 
             fila[alg] = f"{n_clusters} clusters | {round(media_go, 2)} GO medio"
 
         filas.append(fila)
 
-    df = pd.DataFrame(filas)
-
-    # ordenar por score
-    df = df.sort_values(["Red", "Score"])
+    # ordenar por score (sobre la lista: la tabla es diminuta)
+    filas.sort(key=lambda f: (f["Red"], f["Score"]))
 
-    # guardar
+    # guardar: escritura Arrow directa desde la lista de dicts si pyarrow
+    # está instalado; DataFrame + to_csv como alternativa
     out_path = RESULTADOS_DIR / f"resumen_clustering_{modo}.csv"
-    df.to_csv(out_path, index=False)
+    if pacsv is not None:
+        pacsv.write_csv(pa.Table.from_pylist(filas), out_path)
+    else:
+        pd.DataFrame(filas).to_csv(out_path, index=False)
 
     try:
         rel = out_path.relative_to(PROJECT_ROOT)
@@ -144,4 +226,4 @@ def generar_tabla_clusters_avanzada(modo: str, resumen_clusters: dict):
         rel = out_path
 
     print(f"    ✓ Tabla avanzada clustering ({modo}) guardada → {rel}")
-    return df
\ No newline at end of file
+    return filas
\ No newline at end of file
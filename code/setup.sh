@@ -94,6 +94,11 @@ pip install \
     matplotlib \
     requests \
     networkx \
+    numba \
+    orjson \
+    pyarrow \
+    python-igraph \
+    leidenalg \
     pybind11 \
     seaborn
 